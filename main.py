@@ -10,28 +10,92 @@ Usage:
     msi-ec-cli --cooler-boost off  # Disable cooler boost
 """
 
-import argparse
+from types import SimpleNamespace
 from pathlib import Path
 import sys
+import os
 
 class MSIECController:
     MSI_EC_BASE_PATH = Path("/sys/devices/platform/msi-ec")
+    __slots__ = (
+        "base_path", "_fd_cache", "_cpu_temp_path", "_gpu_temp_path", "_cooler_boost_path",
+        "_read_buf",
+    )
     
     def __init__(self):
         self.base_path = self.MSI_EC_BASE_PATH
+        # Sysfs files stay valid for as long as the driver is loaded, so we keep them open
+        # and use pread/pwrite at offset 0 instead of doing open()/close() on every access
+        self._fd_cache = {}
+        # Built once so the polling path doesn't redo the Path arithmetic on every call
+        self._cpu_temp_path = str(self.base_path / "cpu" / "realtime_temperature")
+        self._gpu_temp_path = str(self.base_path / "gpu" / "realtime_temperature")
+        self._cooler_boost_path = str(self.base_path / "cooler_boost")
+        # Temperature reads go into this preallocated buffer with preadv instead of getting a fresh bytes object from pread
+        self._read_buf = bytearray(16)
         
-    def _check_driver_availability(self):
+    @property
+    def cooler_boost_path(self):
+        return self._cooler_boost_path
+
+    def check_driver(self):
+        """Raises FileNotFoundError with install instructions if the msi-ec driver isn't loaded"""
+        # Only called up front by the monitor and after an open fails, the regular reads and
+        # writes don't stat the driver directory every time
         if not self.base_path.exists():
             raise FileNotFoundError(
                 "MSI EC driver not found. Please ensure the msi-ec kernel module is loaded.\n"
                 "Installation: https://github.com/BeardOverflow/msi-ec"
             )
+
+    def prewarm(self):
+        """Opens the files the monitor keeps polling up front, so the first check doesn't have to"""
+        for filepath in (self._cpu_temp_path, self._gpu_temp_path, self._cooler_boost_path):
+            try:
+                self._get_fd(filepath, os.O_RDONLY)
+            except OSError:
+                # Let the actual read report it properly later on
+                pass
+
+    def _get_fd(self, filepath, flags):
+        key = (filepath, flags)
+        fd = self._fd_cache.get(key)
+        if fd is None:
+            fd = os.open(filepath, flags)
+            self._fd_cache[key] = fd
+        return fd
+
+    def _drop_fd(self, filepath, flags):
+        # Once an access on a cached fd fails (e.g. msi-ec got reloaded) it is stale, so forget it
+        # and let the next access open the file again
+        fd = self._fd_cache.pop((filepath, flags), None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def close(self):
+        for fd in self._fd_cache.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fd_cache.clear()
+
+    def __del__(self):
+        self.close()
     
     def _read_sysfs_file(self, filepath):
         try:
-            with open(filepath, 'r') as f:
-                return f.read().strip()
+            fd = self._get_fd(filepath, os.O_RDONLY)
+            try:
+                return os.pread(fd, 64, 0)
+            except OSError:
+                self._drop_fd(filepath, os.O_RDONLY)
+                raise
         except FileNotFoundError:
+            self.check_driver()
             raise FileNotFoundError(f"File not found: {filepath}")
         except PermissionError:
             raise PermissionError(f"Permission denied reading: {filepath}")
@@ -40,54 +104,77 @@ class MSIECController:
     
     def _write_sysfs_file(self, filepath, value):
         try:
-            with open(filepath, 'w') as f:
-                f.write(str(value))
+            fd = self._get_fd(filepath, os.O_WRONLY)
+            try:
+                os.pwrite(fd, str(value).encode(), 0)
+            except OSError:
+                self._drop_fd(filepath, os.O_WRONLY)
+                raise
         except FileNotFoundError:
+            self.check_driver()
             raise FileNotFoundError(f"File not found: {filepath}")
         except PermissionError:
             raise PermissionError(f"Permission denied writing to: {filepath}. Try running with sudo.")
         except Exception as e:
             raise Exception(f"Error writing to {filepath}: {e}")
     
-    def get_cpu_temperature(self):
-        """This is only gonna be in C because that is how the driver outputs it"""
-        self._check_driver_availability()
-        temp_file = self.base_path / "cpu" / "realtime_temperature"
-        temp_raw = self._read_sysfs_file(temp_file)
-        
+    def _read_temp_int(self, filepath):
         try:
-            temp_celsius = int(temp_raw)
-            return f"{temp_celsius}.0°C"
+            fd = self._get_fd(filepath, os.O_RDONLY)
+            try:
+                length = os.preadv(fd, [self._read_buf], 0)
+            except OSError:
+                self._drop_fd(filepath, os.O_RDONLY)
+                raise
+        except FileNotFoundError:
+            self.check_driver()
+            raise FileNotFoundError(f"File not found: {filepath}")
+        except PermissionError:
+            raise PermissionError(f"Permission denied reading: {filepath}")
+        except Exception as e:
+            raise Exception(f"Error reading {filepath}: {e}")
+
+        # int() parses the bytes directly (trailing newline included), no need to decode first
+        try:
+            return int(self._read_buf[:length])
         except ValueError:
-            raise ValueError(f"Invalid temperature value: {temp_raw}")
+            raise ValueError(f"Invalid temperature value: {bytes(self._read_buf[:length])!r}")
+    
+    def read_cpu_temp(self):
+        """Whole degrees C as a plain int, this is what anything doing math with the temps should use"""
+        return self._read_temp_int(self._cpu_temp_path)
+    
+    def read_gpu_temp(self):
+        """Whole degrees C as a plain int, this is what anything doing math with the temps should use"""
+        return self._read_temp_int(self._gpu_temp_path)
+    
+    def get_cpu_temperature(self):
+        """This is only gonna be in C because that is how the driver outputs it, only meant for printing"""
+        return f"{self.read_cpu_temp()}.0°C"
     
     def get_gpu_temperature(self):
-        """This is only gonna be in C because that is how the driver outputs it"""
-        self._check_driver_availability()
-        temp_file = self.base_path / "gpu" / "realtime_temperature"
-        temp_raw = self._read_sysfs_file(temp_file)
-        
-        try:
-            temp_celsius = int(temp_raw)
-            return f"{temp_celsius}.0°C"
-        except ValueError:
-            raise ValueError(f"Invalid temperature value: {temp_raw}")
+        """This is only gonna be in C because that is how the driver outputs it, only meant for printing"""
+        return f"{self.read_gpu_temp()}.0°C"
     
     def set_cooler_boost(self, enable):
-        self._check_driver_availability()
-        cooler_file = self.base_path / "cooler_boost"
+        # Every write ends up as an EC command, so don't send one if nothing would change
+        if self.get_cooler_boost_status() == enable:
+            return f"Cooler boost already {'enabled' if enable else 'disabled'}"
+
         value = "on" if enable else "off"
-        self._write_sysfs_file(cooler_file, value)
+        self._write_sysfs_file(self._cooler_boost_path, value)
         return f"Cooler boost {'enabled' if enable else 'disabled'}"
     
     def get_cooler_boost_status(self):
-        self._check_driver_availability()
-        cooler_file = self.base_path / "cooler_boost"
-        status = self._read_sysfs_file(cooler_file)
-        return status == "on"
+        status = self._read_sysfs_file(self._cooler_boost_path)
+        return status.strip() == b"on"
 
 
-def main():
+def build_parser():
+    # argparse is only imported when it is actually needed, which keeps the single flag calls
+    # and importing this file from manager.py cheap
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="msi_ec cli tool with the only purpose of keeping the temps low via use of automated tooling",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -127,13 +214,27 @@ Note: Requires the msi-ec kernel driver to be installed and loaded.
         action="store_true",
         help="Show current status of all monitored values"
     )
-    
-    args = parser.parse_args()
-    
-    # If no arguments provided, show help
-    if not any(vars(args).values()):
-        parser.print_help()
-        return 1
+
+    return parser
+
+
+def main():
+    # Fast path for the most common single flag calls, no need to build the whole parser for these
+    if len(sys.argv) == 2 and sys.argv[1] in ("--cpu-temp", "--gpu-temp"):
+        args = SimpleNamespace(
+            cpu_temp=sys.argv[1] == "--cpu-temp",
+            gpu_temp=sys.argv[1] == "--gpu-temp",
+            cooler_boost=None,
+            status=False,
+        )
+    else:
+        parser = build_parser()
+        args = parser.parse_args()
+        
+        # If no arguments provided, show help
+        if not any(vars(args).values()):
+            parser.print_help()
+            return 1
     
     controller = MSIECController()
     
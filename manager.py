@@ -3,10 +3,10 @@
 
 """
 
-from pathlib import Path
-import subprocess
-import threading
+from main import MSIECController
 import logging
+import ctypes
+import select
 import signal
 import time
 import sys
@@ -22,19 +22,30 @@ TEMP_OSCILLATION_FIX = 5  # Makes the script disable the cooler boost at TRESHOL
 TIME_OSCILLATION_FIX = 60 # Makes the script disable the cooler boost if the cooler boost has been on for at least THIS_VALUE seconds
 
 CHECK_INTERVAL = 3  # Time in seconds between temperature checks
+WARM_MARGIN = 10  # When temps are at least this many degrees below the thresholds, check every CHECK_INTERVAL * 3 seconds instead
+COOL_MARGIN = 20  # When temps are at least this many degrees below the thresholds, check every CHECK_INTERVAL * 10 seconds instead
 
-MAIN_SCRIPT = "main.py" # Filename of the main script which should be in the current directory
+IN_MODIFY = 0x00000002  # From <sys/inotify.h>
 
 LOG_LEVEL = logging.INFO  # Change to logging.DEBUG for more verbose output
 # ========================
 
 class ThermalMonitor:
+    __slots__ = (
+        "running", "cooler_boost_enabled", "controller", "logger", "last_coolerboost_enabled_at",
+        "_next_interval", "_thresholds", "_hyst", "_signal_fd", "_wakeup_fd", "_inotify_fd",
+    )
+
     def __init__(self):
         self.running = False
         self.cooler_boost_enabled = False
-        self.main_script_path = Path(os.getcwd()) / MAIN_SCRIPT
+        self.controller = MSIECController()
         self.setup_logging()
-        self.last_coolerboost_enabled_at = 0
+        # Monotonic timestamp, starts out as "long ago" so a cooler boost that was already on can be turned off right away
+        self.last_coolerboost_enabled_at = float("-inf")
+        self._next_interval = CHECK_INTERVAL
+        self._thresholds = (CPU_TEMP_THRESHOLD, GPU_TEMP_THRESHOLD)
+        self._hyst = (CPU_TEMP_THRESHOLD - TEMP_OSCILLATION_FIX, GPU_TEMP_THRESHOLD - TEMP_OSCILLATION_FIX)
         
     def setup_logging(self):
         logging.basicConfig(
@@ -44,137 +55,188 @@ class ThermalMonitor:
         )
         self.logger = logging.getLogger(__name__)
         
-    def check_main_script(self):
-        if not self.main_script_path.exists():
-            raise FileNotFoundError(
-                f"Main script not found: {self.main_script_path}\n"
-                f"Please ensure '{MAIN_SCRIPT}' is in the current directory: {os.getcwd()}"
-            )
-
-        if not os.access(self.main_script_path, os.R_OK):
-            raise PermissionError(f"Cannot read {self.main_script_path}")
-            
-    def run_main_script(self, *args):
+    def get_temperature(self, temp_type):
         try:
-            cmd = [sys.executable, str(self.main_script_path)] + list(args)
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                self.logger.error(f"Main script failed: {result.stderr}")
-                return None
-                
-            return result.stdout.strip()
-            
-        except subprocess.TimeoutExpired:
-            self.logger.error("Main script timed out")
-            return None
+            if temp_type == "cpu":
+                return self.controller.read_cpu_temp()
+            elif temp_type == "gpu":
+                return self.controller.read_gpu_temp()
         except Exception as e:
-            self.logger.error(f"Error running main script: {e}")
-            return None
+            self.logger.error("Failed to read the %s temperature: %s", temp_type, e)
+        return None
     
-    def get_temperature(self, temp_type):
-        if temp_type == "cpu":
-            output = self.run_main_script("--cpu-temp")
-        elif temp_type == "gpu":
-            output = self.run_main_script("--gpu-temp")
-        else:
-            return None
-            
-        if output is None:
-            return None
-            
-        try:
-            # Parse the cpu or gpu temp from the "XX.0°C" format
-            temp_str = output.split(": ")[1]
-            temp_value = float(temp_str.replace("°C", ""))
-            return temp_value
-        except (IndexError, ValueError) as e:
-            self.logger.error(f"Failed to parse the temperature from: {output}")
-            return None
+    def get_temperatures(self):
+        # Each sensor is read on its own so a single broken one doesn't take the other one with it
+        return self.get_temperature("cpu"), self.get_temperature("gpu")
     
     def set_cooler_boost(self, enable):
-        state = "on" if enable else "off"
-        output = self.run_main_script("--cooler-boost", state)
-        
-        if output is not None:
-            self.cooler_boost_enabled = enable
-            self.logger.info(f"Cooler boost {'enabled' if enable else 'disabled'}")
-            return True
-        else:
-            self.logger.error(f"Failed to {'enable' if enable else 'disable'} cooler boost")
+        try:
+            self.controller.set_cooler_boost(enable)
+        except Exception as e:
+            self.logger.error("Failed to %s cooler boost: %s", "enable" if enable else "disable", e)
             return False
 
+        self.cooler_boost_enabled = enable
+        self.logger.info("Cooler boost %s", "enabled" if enable else "disabled")
+        return True
+
+    
+    def update_interval(self, cpu_temp, gpu_temp):
+        # No point in waking up every few seconds when the temps are nowhere near the thresholds
+        margins = []
+        if cpu_temp is not None:
+            margins.append(CPU_TEMP_THRESHOLD - cpu_temp)
+        if gpu_temp is not None:
+            margins.append(GPU_TEMP_THRESHOLD - gpu_temp)
+
+        margin = min(margins)
+        if margin < WARM_MARGIN or self.cooler_boost_enabled:
+            self._next_interval = CHECK_INTERVAL
+        elif margin < COOL_MARGIN:
+            self._next_interval = CHECK_INTERVAL * 3
+        else:
+            self._next_interval = CHECK_INTERVAL * 10
     
     def check_temperatures(self):
-        cpu_temp = self.get_temperature("cpu")
-        gpu_temp = self.get_temperature("gpu")
+        # Fall back to the regular interval if anything below fails
+        self._next_interval = CHECK_INTERVAL
+        # Monotonic so a wall clock jump or a suspend/resume can't mess with TIME_OSCILLATION_FIX
+        now = time.monotonic()
+        cpu_temp, gpu_temp = self.get_temperatures()
         
         if cpu_temp is None and gpu_temp is None:
             self.logger.error("Failed to read both CPU and GPU temperatures")
             return
 
-        temp_info = []
-        if cpu_temp is not None:
-            temp_info.append(f"CPU: {cpu_temp}°C")
-        if gpu_temp is not None:
-            temp_info.append(f"GPU: {gpu_temp}°C")
-        
-        self.logger.debug(f"Temperatures - {', '.join(temp_info)}")
-        
-        # Deciding whenever to enable the cooler boost or not
-        should_enable = False
-        temp_reasons = []
-        
-        if cpu_temp is not None and cpu_temp > CPU_TEMP_THRESHOLD:
-            should_enable = True
-            temp_reasons.append(f"CPU {cpu_temp}°C > {CPU_TEMP_THRESHOLD}°C")
+        # Don't build the debug line at all unless it is actually going to be logged
+        if self.logger.isEnabledFor(logging.DEBUG):
+            temp_info = []
+            if cpu_temp is not None:
+                temp_info.append(f"CPU: {cpu_temp}°C")
+            if gpu_temp is not None:
+                temp_info.append(f"GPU: {gpu_temp}°C")
             
-        if gpu_temp is not None and gpu_temp > GPU_TEMP_THRESHOLD:
-            should_enable = True
-            temp_reasons.append(f"GPU {gpu_temp}°C > {GPU_TEMP_THRESHOLD}°C")
+            self.logger.debug("Temperatures - %s", ", ".join(temp_info))
         
+        # Deciding whenever to enable the cooler boost or not, a missing reading counts as -1 so it is
+        # never hot and always below the hysteresis point
+        cpu = -1 if cpu_temp is None else cpu_temp
+        gpu = -1 if gpu_temp is None else gpu_temp
+        cpu_threshold, gpu_threshold = self._thresholds
+        cpu_hyst, gpu_hyst = self._hyst
+
+        hot = cpu > cpu_threshold or gpu > gpu_threshold
+        cool = cpu < cpu_hyst and gpu < gpu_hyst
+
         # Prevent oscillation
-        if self.cooler_boost_enabled and not should_enable:
-            cpu_safe = cpu_temp is None or cpu_temp < (CPU_TEMP_THRESHOLD - TEMP_OSCILLATION_FIX)
-            gpu_safe = gpu_temp is None or gpu_temp < (GPU_TEMP_THRESHOLD - TEMP_OSCILLATION_FIX)
-            
-            if not (cpu_safe and gpu_safe):
-                should_enable = True
-                self.logger.debug("Keeping cooler boost enabled due to hysteresis")
+        should_enable = hot or (self.cooler_boost_enabled and not cool)
         
         # Apply the cooler boost state
         if should_enable and not self.cooler_boost_enabled:
-            self.logger.info(f"Enabling cooler boost: {', '.join(temp_reasons)}")
+            temp_reasons = []
+            if cpu > cpu_threshold:
+                temp_reasons.append(f"CPU {cpu_temp}°C > {cpu_threshold}°C")
+            if gpu > gpu_threshold:
+                temp_reasons.append(f"GPU {gpu_temp}°C > {gpu_threshold}°C")
+
+            self.logger.info("Enabling cooler boost: %s", ", ".join(temp_reasons))
             self.set_cooler_boost(True)
-            self.last_coolerboost_enabled_at = time.time()
+            self.last_coolerboost_enabled_at = now
             
-        elif not should_enable and self.cooler_boost_enabled and time.time() - self.last_coolerboost_enabled_at > TIME_OSCILLATION_FIX:
+        elif not should_enable and self.cooler_boost_enabled and now - self.last_coolerboost_enabled_at > TIME_OSCILLATION_FIX:
             disable_reasons = []
             if cpu_temp is not None:
                 disable_reasons.append(f"CPU {cpu_temp}°C")
             if gpu_temp is not None:
                 disable_reasons.append(f"GPU {gpu_temp}°C")
             
-            self.logger.info(f"Disabling cooler boost: temperatures normal ({', '.join(disable_reasons)})")
+            self.logger.info("Disabling cooler boost: temperatures normal (%s)", ", ".join(disable_reasons))
             self.set_cooler_boost(False)
+
+        elif should_enable and not hot:
+            self.logger.debug("Keeping cooler boost enabled due to hysteresis")
+
+        self.update_interval(cpu_temp, gpu_temp)
     
     def monitor_loop(self):
         self.logger.info("Starting thermal monitoring...")
-        self.logger.info(f"CPU threshold: {CPU_TEMP_THRESHOLD}°C, GPU threshold: {GPU_TEMP_THRESHOLD}°C")
-        self.logger.info(f"Check interval: {CHECK_INTERVAL}s, Temp oscillation fix: {TEMP_OSCILLATION_FIX}°C Time oscillation fix: {TIME_OSCILLATION_FIX}s")
+        self.logger.info("CPU threshold: %s°C, GPU threshold: %s°C", CPU_TEMP_THRESHOLD, GPU_TEMP_THRESHOLD)
+        self.logger.info(
+            "Check interval: %ss, Temp oscillation fix: %s°C Time oscillation fix: %ss",
+            CHECK_INTERVAL, TEMP_OSCILLATION_FIX, TIME_OSCILLATION_FIX
+        )
         
         while self.running:
             try:
                 self.check_temperatures()
-                time.sleep(CHECK_INTERVAL)
             except Exception as e:
-                self.logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(CHECK_INTERVAL)
+                self.logger.error("Error in monitoring loop: %s", e)
+
+            self.wait_for_next_check()
+
+    def wait_for_next_check(self):
+        # A single blocking select handles the check interval, the shutdown signals and outside changes
+        # to the cooler boost, so nothing wakes up in between checks unless something actually happened
+        fds = [self._signal_fd]
+        if self._inotify_fd is not None:
+            fds.append(self._inotify_fd)
+
+        deadline = time.monotonic() + self._next_interval
+        while self.running:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+
+            readable, _, _ = select.select(fds, [], [], timeout)
+            if not readable:
+                return
+
+            if self._signal_fd in readable:
+                signums = os.read(self._signal_fd, 64)
+                self.logger.info("Received signal %s", signal.Signals(signums[0]).name)
+                self.stop()
+                return
+
+            if self._inotify_fd in readable:
+                os.read(self._inotify_fd, 4096)
+                self.sync_cooler_boost()
+
+    def watch_cooler_boost(self):
+        # No inotify in the stdlib, so go through libc directly
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+            if libc.inotify_add_watch(fd, self.controller.cooler_boost_path.encode(), IN_MODIFY) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, "inotify_add_watch failed")
+        except (OSError, AttributeError) as e:
+            self.logger.warning("Can't watch the cooler boost for outside changes: %s", e)
+            return None
+
+        return fd
+
+    def sync_cooler_boost(self):
+        # Something wrote to the cooler boost file (this script included), see if it still matches what we think it is
+        try:
+            enabled = self.controller.get_cooler_boost_status()
+        except Exception as e:
+            self.logger.error("Failed to read the cooler boost state: %s", e)
+            return
+
+        if enabled != self.cooler_boost_enabled:
+            self.logger.info("Cooler boost was %s from outside of this script", "enabled" if enabled else "disabled")
+            self.cooler_boost_enabled = enabled
+            if enabled:
+                # Give it the same minimum on time as if we turned it on ourselves
+                self.last_coolerboost_enabled_at = time.monotonic()
+
+    def _handle_signal(self, signum, frame):
+        # Nothing to do here, the signal number is written to the wakeup fd which wakes up monitor_loop
+        pass
     
     def start(self):
         if self.running:
@@ -182,14 +244,28 @@ class ThermalMonitor:
             return
             
         try:
-            self.check_main_script()
+            self.controller.check_driver()
         except (FileNotFoundError, PermissionError) as e:
             self.logger.error(str(e))
             return False
+
+        self.controller.prewarm()
+
+        # Start from whatever state the hardware is actually in, so the first check doesn't mis-toggle
+        try:
+            self.cooler_boost_enabled = self.controller.get_cooler_boost_status()
+        except Exception as e:
+            self.logger.warning("Failed to read the current cooler boost state: %s", e)
+
+        # Handle the shutdown signals well-ish
+        self._signal_fd, self._wakeup_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        signal.set_wakeup_fd(self._wakeup_fd)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+
+        self._inotify_fd = self.watch_cooler_boost()
             
         self.running = True
-        self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
-        self.monitor_thread.start()
         self.logger.info("Thermal monitor started")
         return True
     
@@ -199,51 +275,40 @@ class ThermalMonitor:
             
         self.logger.info("Stopping the thermal monitor...")
         self.running = False
-        
-        if hasattr(self, 'monitor_thread'):
-            self.monitor_thread.join(timeout=5)
+
+        # Hand the signals back to the default handlers so the rest of the shutdown can still be interrupted
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
 
         # Disable cooler boost on exit if it is set to do so
         if DISABLE_COOLER_BOOST_ON_EXIT:
             if self.cooler_boost_enabled:
                 self.logger.info("Disabling cooler boost before exit")
                 self.set_cooler_boost(False)
-            
-        self.logger.info("Thermal monitor stopped")
-        sys.exit(0)
 
+        os.close(self._signal_fd)
+        os.close(self._wakeup_fd)
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
 
-def signal_handler(signum, frame):
-    # Handle the shutdown signals well-ish
-    global monitor
-    if monitor:
-        monitor.stop()
-    sys.exit(0)
+        self.controller.close()
+        self.logger.info("Thermal monitor stopped")
 
 
 def main():
-    global monitor
-    
     print("MSI Thermal Monitor Service")
     print(f"CPU Threshold: {CPU_TEMP_THRESHOLD}°C, GPU Threshold: {GPU_TEMP_THRESHOLD}°C")
     print(f"Check Interval: {CHECK_INTERVAL}s")
-    print(f"Main script: {MAIN_SCRIPT} (in {os.getcwd()})")
     print("-" * 50)
     
-    # Handle the shutdown signals well-ish
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     monitor = ThermalMonitor()
     
     if not monitor.start():
         return 1
     
     try:
-        while monitor.running:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        pass
+        monitor.monitor_loop()
     finally:
         monitor.stop()
     
@@ -251,5 +316,4 @@ def main():
 
 
 if __name__ == "__main__":
-    monitor = None
     sys.exit(main())
\ No newline at end of file